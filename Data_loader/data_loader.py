@@ -3,30 +3,151 @@ data_loader.py
 - functions to read CSV or connect to a DB (DB connection placeholder)
 - returns pandas DataFrame and simple schema
 """
+import functools
+import numpy as np
 import pandas as pd
-from typing import Tuple, Dict
+from typing import Tuple, Dict, Iterable, Iterator, Optional, Union
 import sqlalchemy
+from sqlalchemy.sql import quoted_name
 
-def read_csv(path: str, parse_dates=None) -> pd.DataFrame:
+# rows per DataFrame yielded by read_csv_chunks
+DEFAULT_CSV_CHUNKSIZE = 200_000
+# rows fetched per round-trip when streaming a table into a single DataFrame
+DEFAULT_SQL_CHUNKSIZE = 64_000
+
+@functools.lru_cache(maxsize=32)
+def get_engine(conn_string: str) -> sqlalchemy.engine.Engine:
+    """
+    One engine (and connection pool) per connection string, reused across calls
+    so the pool, dialect and compiled-statement cache are not rebuilt every time.
+    """
+    return sqlalchemy.create_engine(conn_string, pool_pre_ping=True)
+
+def select_all(table_name: str) -> sqlalchemy.Select:
+    """
+    SELECT * for `table_name` ("table" or "schema.table") without reflecting it,
+    so columns are never stale; add .limit() and the dialect renders LIMIT / TOP / FETCH FIRST.
+    The name is emitted verbatim (never quoted or split), as typed by the user.
+    """
+    # one unquoted identifier: no schema split, so dialects never rewrite it
+    return sqlalchemy.select(sqlalchemy.literal_column("*")).select_from(
+        sqlalchemy.table(quoted_name(table_name, quote=False)))
+
+# object columns with fewer distinct values than this share of rows become category
+CATEGORY_MAX_RATIO = 0.5
+
+def downcast_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Shrinks numpy-backed columns in place: int64/float64 to the smallest type that holds
+    the values, low-cardinality object columns to category. Float columns may lose
+    precision (float32 keeps ~7 significant digits).
+    """
+    int_cols = df.select_dtypes(include=["integer"]).columns
+    if len(int_cols):
+        df[int_cols] = df[int_cols].apply(pd.to_numeric, downcast="integer")
+    float_cols = df.select_dtypes(include=["floating"]).columns
+    if len(float_cols):
+        df[float_cols] = df[float_cols].apply(pd.to_numeric, downcast="float")
+    if len(df):
+        for c in df.select_dtypes(include=["object"]).columns:
+            if df[c].nunique() / len(df) < CATEGORY_MAX_RATIO:
+                df[c] = df[c].astype("category")
+    return df
+
+def read_csv(path: str, parse_dates=None, use_arrow: bool = False, downcast: bool = False) -> pd.DataFrame:
+    """
+    use_arrow=True parses with pyarrow's multithreaded reader and keeps Arrow-backed
+    dtypes (e.g. string[pyarrow] instead of object), which is faster and much smaller
+    in memory for string-heavy files. Requires pyarrow.
+    downcast=True applies downcast_frame() to the numpy-backed result (ignored with use_arrow).
+    """
+    if use_arrow:
+        return pd.read_csv(path, parse_dates=parse_dates, engine="pyarrow", dtype_backend="pyarrow")
     df = pd.read_csv(path, parse_dates=parse_dates)
+    if downcast:
+        df = downcast_frame(df)
     return df
 
-def read_sql_table(conn_string: str, table_name: str, limit:int=None) -> pd.DataFrame:
+def read_csv_chunks(path: str, chunksize: int = DEFAULT_CSV_CHUNKSIZE, parse_dates=None) -> Iterator[pd.DataFrame]:
+    """
+    Iterator of DataFrames with at most `chunksize` rows, for files too large to load at once.
+    Pair with aggregate_schema() for a single-pass schema; only when the full frame is really
+    needed, build it once with pd.concat(list(chunks), copy=False).
+    """
+    return pd.read_csv(path, chunksize=chunksize, parse_dates=parse_dates, engine="c")
+
+def _merge_dtype(a, b):
+    if a == b:
+        return a
+    try:
+        return np.result_type(a, b)
+    except TypeError:
+        return np.dtype(object)
+
+def aggregate_schema(chunks: Iterable[pd.DataFrame]) -> Dict:
+    """
+    describe_schema() over an iterator of chunks in one pass: non-null counts are summed,
+    the first 3 samples seen are kept and dtypes are promoted the way pd.concat would.
+    """
+    dtypes, schema = {}, {}
+    for chunk in chunks:
+        part = describe_schema(chunk)
+        for c, info in part.items():
+            if c not in schema:
+                dtypes[c] = chunk[c].dtype
+                schema[c] = info
+                continue
+            dtypes[c] = _merge_dtype(dtypes[c], chunk[c].dtype)
+            schema[c]["non_null"] += info["non_null"]
+            missing = 3 - len(schema[c]["sample"])
+            if missing > 0:
+                schema[c]["sample"].extend(info["sample"][:missing])
+    for c, dtype in dtypes.items():
+        schema[c]["dtype"] = str(dtype)
+    return schema
+
+def _iter_sql_chunks(engine, query, chunksize: int, stream: bool) -> Iterator[pd.DataFrame]:
+    # keep the connection open for as long as the caller is consuming chunks
+    with engine.connect() as conn:
+        if stream:
+            conn = conn.execution_options(stream_results=True)
+        for chunk in pd.read_sql(query, conn, chunksize=chunksize):
+            yield chunk
+
+def read_sql_table(conn_string: str, table_name: str, limit: int = None,
+                   chunksize: Optional[int] = None, stream: bool = True) -> Union[pd.DataFrame, Iterator[pd.DataFrame]]:
     """
     Placeholder for DB read. Uses SQLAlchemy connection string.
+
+    With stream=True the driver uses a server-side cursor (psycopg2, pymysql, ...)
+    so rows are pulled in batches instead of buffered client-side all at once.
+    - chunksize=None: returns a single DataFrame, concatenated once from the chunks.
+    - chunksize=N: returns an iterator of DataFrames with at most N rows each.
+    When writing the chunks elsewhere, append each one (e.g. to_sql(..., if_exists="append"))
+    or collect them and pd.concat once at the end; never concat inside the loop.
     """
-    engine = sqlalchemy.create_engine(conn_string)
-    query = f"SELECT * FROM {table_name}"
+    engine = get_engine(conn_string)
+    query = select_all(table_name)
     if limit:
-        query += f" LIMIT {limit}"
-    df = pd.read_sql(query, engine)
-    return df
+        query = query.limit(limit)
+    if chunksize is not None:
+        return _iter_sql_chunks(engine, query, chunksize, stream)
+    # an empty result still yields one empty chunk carrying the column names
+    return pd.concat(_iter_sql_chunks(engine, query, DEFAULT_SQL_CHUNKSIZE, stream), ignore_index=True)
 
+# rows inspected when picking sample values for describe_schema
+SCHEMA_SAMPLE_ROWS = 100
 def describe_schema(df: pd.DataFrame) -> Dict:
+    """
+    Per-column dtype, non-null count and up to 3 sample values,
+    computed in one vectorised pass over the frame.
+    """
+    dtypes = df.dtypes.astype(str).to_dict()
+    non_null = (len(df) - df.isna().sum()).to_dict()
+    # only the head is ever cast to str, so sampling cost does not grow with row count
+    head = df.head(SCHEMA_SAMPLE_ROWS)
     schema = {}
     for c in df.columns:
-        dtype = str(df[c].dtype)
-        non_null = int(df[c].notnull().sum())
-        sample = df[c].dropna().astype(str).head(3).tolist()
-        schema[c] = {"dtype":dtype, "non_null":non_null, "sample":sample}
+        sample = head[c].dropna().head(3).astype(str).tolist()
+        schema[c] = {"dtype":dtypes[c], "non_null":int(non_null[c]), "sample":sample}
     return schema
@@ -5,27 +5,40 @@ db_wizard.py
 - These functions are lightweight connection testers. Users must install appropriate drivers.
 """
 from typing import Tuple, Optional
-import sqlalchemy
+from sqlalchemy import select, literal_column
+from sqlalchemy.engine import URL
 import traceback
+from Data_loader.data_loader import get_engine, select_all
+
+def _render_url(drivername: str, host: str, port: Optional[int], database: str, username: str, password: str,
+                extra: str="", query: Optional[dict]=None) -> str:
+    # URL.create escapes special characters (@ / : ...) in credentials instead of splicing them into the string
+    url = URL.create(drivername=drivername, username=username, password=password,
+                     host=host, port=port, database=database, query=query or {})
+    extra = extra.lstrip("?&")
+    if extra:
+        url = url.update_query_string(extra, append=True)
+    return url.render_as_string(hide_password=False)
 
 def build_sqlalchemy_string(db_type: str, host: str, port: Optional[int], database: str, username: str, password: str, extra: str="") -> str:
     db_type = db_type.lower()
     if db_type in ("postgres", "postgresql"):
         port = port or 5432
-        return f"postgresql://{username}:{password}@{host}:{port}/{database}{extra}"
+        return _render_url("postgresql", host, port, database, username, password, extra)
     if db_type in ("mysql", "mariadb"):
         port = port or 3306
-        return f"mysql+pymysql://{username}:{password}@{host}:{port}/{database}{extra}"
+        return _render_url("mysql+pymysql", host, port, database, username, password, extra)
     if db_type in ("mssql","sqlserver"):
         port = port or 1433
         # using pyodbc; user needs to have ODBC DSN or driver installed
-        return f"mssql+pyodbc://{username}:{password}@{host}:{port}/{database}?driver=ODBC+Driver+17+for+SQL+Server{extra}"
+        return _render_url("mssql+pyodbc", host, port, database, username, password, extra,
+                           query={"driver": "ODBC Driver 17 for SQL Server"})
     if db_type in ("sqlite",):
-        return f"sqlite:///{database}"
+        return URL.create("sqlite", database=database).render_as_string()
     if db_type in ("hive",):
         port = port or 10000
         # requires PyHive and a Thrift hive server
-        return f"hive://{username}:{password}@{host}:{port}/{database}{extra}"
+        return _render_url("hive", host, port, database, username, password, extra)
     # Iceberg and HBase are special: return placeholders
     if db_type in ("hbase",):
         return "hbase://{host}:{port} (use happybase client)"
@@ -33,11 +46,12 @@ def build_sqlalchemy_string(db_type: str, host: str, port: Optional[int], databa
         return "iceberg:// (use spark or pyiceberg for connection)"
     raise ValueError("Unsupported db_type: " + db_type)
 
-def test_db_connection(conn_str: str, table: Optional[str]=None, limit: int=1) -> Tuple[bool, str]:
+def test_db_connection(conn_str: str, table: Optional[str]=None, limit: int=1, verbose: bool=False) -> Tuple[bool, str]:
     """
     Attempts to connect using SQLAlchemy engine and run a lightweight query.
     Returns (success, message).
     For HBase/Iceberg connection strings, this function will return a friendly message telling user what to install.
+    Set verbose=True to append the full traceback to the failure message.
     """
     try:
         if conn_str.startswith("hbase://"):
@@ -46,23 +60,16 @@ def test_db_connection(conn_str: str, table: Optional[str]=None, limit: int=1) -
         if conn_str.startswith("iceberg://") or "iceberg" in conn_str:
             return False, ("Iceberg detected: typically accessed via Spark or PyIceberg. "
                            "This tester only supports SQLAlchemy-accessible endpoints. Use Spark + PyIceberg for Iceberg tables.")
-        engine = sqlalchemy.create_engine(conn_str)
+        engine = get_engine(conn_str)
         with engine.connect() as conn:
+            # liveness probe; built with select() so e.g. Oracle gets its FROM DUAL
+            conn.execute(select(literal_column("1"))).fetchone()
             if table:
-                # try a minimal test query
-                q = f"SELECT * FROM {table} LIMIT {limit}"
-                res = conn.execute(q)
-                # fetch one row
-                _ = res.fetchone()
-            else:
-                # run a lightweight version query depending on dialect
-                if engine.dialect.name in ("postgresql","mysql","mariadb","mssql","sqlite"):
-                    res = conn.execute("SELECT 1")
-                    _ = res.fetchone()
-                else:
-                    res = conn.execute("SELECT 1")
-                    _ = res.fetchone()
+                # let the dialect render the row limit (LIMIT / TOP / FETCH FIRST)
+                conn.execute(select_all(table).limit(limit)).fetchone()
         return True, "Connection successful and test query executed."
     except Exception as e:
+        if not verbose:
+            return False, f"Connection failed: {e!r}"
         tb = traceback.format_exc()
         return False, f"Connection failed: {str(e)}\n\nTraceback:\n{tb}"
@@ -13,28 +13,157 @@ Features:
 from typing import List, Dict, Any, Optional, Tuple
 import pandas as pd
 import numpy as np
-import math
+import re
+import warnings
+
+try:  # optional: JIT-compiled z-score kernels
+    import numba
+except ImportError:
+    numba = None
+
+
+# Common ID-like or non-business columns to skip in KPI summaries
+EXCLUDE_KEYWORDS = ("id", "code", "zip", "key", "number")
+_EXCLUDE_RE = re.compile("|".join(map(re.escape, EXCLUDE_KEYWORDS)), re.IGNORECASE)
+
+# Insight phrasing templates
+_TMPL_LARGE = (
+    "**{name}** averages around {avg:,.2f}, "
+    "totaling {total:,.0f}. Values range between {minv:,.2f} and {maxv:,.2f}, "
+    "showing significant spread."
+)
+_TMPL_MEDIUM = (
+    "**{name}** shows moderate variation, "
+    "averaging {avg:,.2f} (min {minv:,.2f}, max {maxv:,.2f})."
+)
+_TMPL_STABLE = (
+    "**{name}** remains relatively stable, "
+    "averaging {avg:,.2f} with limited variability."
+)
+_TMPL_CORR = (
+    "A notable correlation (**r = {r:.2f}**) exists between **{c1}** and **{c2}**, "
+    "indicating they move closely together — potentially useful for predictive modeling."
+)
+_TMPL_ANOMALY = (
+    "**{name}** shows {count} unusual data points (anomalies), "
+    "which may represent exceptional cases, outliers, or potential data errors."
+)
 
 
 # ---------------------------------------------------
 # Helper Functions
 # ---------------------------------------------------
 
-def compute_correlations(df: pd.DataFrame, min_corr: float = 0.3) -> List[Tuple[str, str, float]]:
-    """Finds strong numeric correlations."""
-    numeric = df.select_dtypes(include=[np.number])
+def _pearson_matrix(numeric: pd.DataFrame) -> np.ndarray:
+    """Pearson correlation matrix; one float32 matmul when there are no missing values."""
+    mat = numeric.to_numpy(dtype=np.float64, na_value=np.nan)
+    if len(mat) < 2 or np.isnan(mat).any():
+        # pandas handles missing values pairwise, which a single matmul cannot
+        return numeric.corr().to_numpy()
+    # standardise in float64 (raw amounts can be large), multiply in float32 (values are O(1))
+    mat = mat - mat.mean(axis=0)
+    std = mat.std(axis=0)
+    std[std == 0] = np.nan
+    z = (mat / std).astype(np.float32)
+    corr = (z.T @ z) / z.shape[0]
+    return np.clip(corr, -1.0, 1.0)
+
+
+def compute_correlations(df: pd.DataFrame, min_corr: float = 0.3,
+                         numeric_df: Optional[pd.DataFrame] = None,
+                         top_k: Optional[int] = None) -> List[Tuple[str, str, float]]:
+    """
+    Finds strong numeric correlations. Pass numeric_df to reuse an existing numeric selection;
+    top_k returns only the k strongest pairs without sorting all of them.
+    """
+    numeric = df.select_dtypes(include=[np.number]) if numeric_df is None else numeric_df
     if numeric.shape[1] < 2:
         return []
-    corr = numeric.corr().abs()
-    pairs = []
-    for i, c1 in enumerate(corr.columns):
-        for j, c2 in enumerate(corr.columns):
-            if j <= i:
+    cols = numeric.columns.to_numpy()
+    corr = np.abs(_pearson_matrix(numeric))
+    # upper triangle only (j > i), scanned in one numpy pass
+    iu = np.triu_indices_from(corr, k=1)
+    vals = corr[iu]
+    mask = vals >= min_corr
+    first, second, vals = iu[0][mask], iu[1][mask], vals[mask]
+    if top_k is not None and top_k < len(vals):
+        if top_k <= 0:
+            return []
+        # O(P) partition to find the k-th strongest value, then stable-sort only the pairs
+        # at or above it (ties included), so the result equals the full sort sliced to top_k
+        kth = np.partition(vals, len(vals) - top_k)[len(vals) - top_k]
+        keep = np.flatnonzero(vals >= kth)
+        order = keep[np.argsort(-vals[keep], kind="stable")][:top_k]
+    else:
+        order = np.argsort(-vals, kind="stable")
+    return [(cols[first[k]], cols[second[k]], float(vals[k])) for k in order]
+
+
+def _zscores_np(nums: np.ndarray) -> np.ndarray:
+    with warnings.catch_warnings():
+        # all-NaN / single-value columns yield NaN stats and NaN z-scores
+        warnings.simplefilter("ignore", category=RuntimeWarning)
+        mu = np.nanmean(nums, axis=0)
+        sigma = np.nanstd(nums, axis=0, ddof=1)
+    sigma = np.where(sigma == 0, np.nan, sigma)
+    return (nums - mu) / sigma
+
+
+def _zscore_outliers_np(vals: np.ndarray, z_thresh: float) -> Tuple[np.ndarray, np.ndarray]:
+    z = _zscores_np(vals[:, None])[:, 0]
+    with np.errstate(invalid="ignore"):
+        return np.abs(z) >= z_thresh, z
+
+
+def _zscore_counts_np(nums: np.ndarray, z_thresh: float) -> np.ndarray:
+    with np.errstate(invalid="ignore"):
+        return (np.abs(_zscores_np(nums)) >= z_thresh).sum(axis=0)
+
+
+if numba is not None:
+    @numba.njit(cache=True)
+    def _nan_mean_std(vals):
+        # Welford's online mean/variance, skipping NaN; ddof=1 like pandas
+        n, mean, m2 = 0, 0.0, 0.0
+        for x in vals:
+            if not np.isnan(x):
+                n += 1
+                d = x - mean
+                mean += d / n
+                m2 += d * (x - mean)
+        if n < 2:
+            return mean, np.nan
+        return mean, np.sqrt(m2 / (n - 1))
+
+    @numba.njit(cache=True)
+    def _zscore_outliers(vals, z_thresh):
+        mu, sigma = _nan_mean_std(vals)
+        z = np.full(vals.shape[0], np.nan)
+        mask = np.zeros(vals.shape[0], dtype=np.bool_)
+        if sigma == 0 or np.isnan(sigma):
+            return mask, z
+        for i in range(vals.shape[0]):
+            z[i] = (vals[i] - mu) / sigma
+            mask[i] = abs(z[i]) >= z_thresh
+        return mask, z
+
+    # serial on purpose: Streamlit runs sessions on separate threads, and numba's
+    # fallback "workqueue" threading layer aborts on concurrent parallel calls
+    @numba.njit(cache=True)
+    def _zscore_counts(nums, z_thresh):
+        counts = np.zeros(nums.shape[1], dtype=np.int64)
+        for j in range(nums.shape[1]):
+            col = nums[:, j]
+            mu, sigma = _nan_mean_std(col)
+            if sigma == 0 or np.isnan(sigma):
                 continue
-            val = corr.loc[c1, c2]
-            if abs(val) >= min_corr:
-                pairs.append((c1, c2, float(val)))
-    return sorted(pairs, key=lambda x: -abs(x[2]))
+            for x in col:
+                if abs((x - mu) / sigma) >= z_thresh:
+                    counts[j] += 1
+        return counts
+else:
+    _zscore_outliers = _zscore_outliers_np
+    _zscore_counts = _zscore_counts_np
 
 
 def detect_anomalies_zscore(df: pd.DataFrame, value_col: str, z_thresh: float = 3.0) -> List[Dict]:
@@ -42,57 +171,58 @@ def detect_anomalies_zscore(df: pd.DataFrame, value_col: str, z_thresh: float =
     if value_col not in df.columns:
         return []
     vals = df[value_col].astype(float)
-    mu, sigma = vals.mean(), vals.std()
-    if sigma == 0 or math.isnan(sigma):
-        return []
-    z = (vals - mu) / sigma
-    outliers = z[abs(z) >= z_thresh]
-    return [{"index": int(i), "value": float(vals.loc[i]), "z": float(z.loc[i])} for i in outliers.index]
+    vals_np = vals.to_numpy(dtype=np.float64, na_value=np.nan)
+    idx_np = vals.index.to_numpy()
+    mask, z_np = _zscore_outliers(vals_np, float(z_thresh))
+    # positional indexing only; no per-outlier label lookups
+    return [{"index": int(idx_np[p]), "value": float(vals_np[p]), "z": float(z_np[p])} for p in np.flatnonzero(mask)]
+
+
+def detect_anomalies_all(df: pd.DataFrame, z_thresh: float = 3.0,
+                         numeric_df: Optional[pd.DataFrame] = None) -> Dict[str, int]:
+    """Counts z-score anomalies for every numeric column in a single fused pass."""
+    numeric = df.select_dtypes(include=[np.number]) if numeric_df is None else numeric_df
+    if numeric.shape[1] == 0:
+        return {}
+    nums = numeric.to_numpy(dtype=np.float64, na_value=np.nan)
+    counts = _zscore_counts(nums, float(z_thresh))
+    return {col: int(n) for col, n in zip(numeric.columns, counts)}
 
 
 # ---------------------------------------------------
 # Main Insight Generator
 # ---------------------------------------------------
 
-def basic_kpi_insights(df: pd.DataFrame) -> List[str]:
+def _pretty(col: str) -> str:
+    return col.replace('_', ' ').title()
+
+
+def basic_kpi_insights(df: pd.DataFrame, numeric_df: Optional[pd.DataFrame] = None) -> List[str]:
     insights = []
-    numeric_cols = df.select_dtypes(include=[np.number]).columns
+    if numeric_df is None:
+        numeric_df = df.select_dtypes(include=[np.number])
+    numeric_cols = numeric_df.columns
 
-    # Common ID-like or non-business columns to skip
-    exclude_keywords = ["id", "code", "zip", "key", "number"]
-    filtered_cols = [
-        col for col in numeric_cols
-        if not any(ex_kw.lower() in col.lower() for ex_kw in exclude_keywords)
-    ]
+    filtered_cols = [col for col in numeric_cols if not _EXCLUDE_RE.search(col)]
+
+    # one aggregation over all KPI columns instead of four scans per column
+    stats = numeric_df[filtered_cols].agg(["sum", "mean", "min", "max"]) if filtered_cols else None
 
     for col in filtered_cols:
-        total = df[col].sum()
-        avg = df[col].mean()
-        minv = df[col].min()
-        maxv = df[col].max()
+        total, avg, minv, maxv = stats[col]
 
         # Heuristic: Check if variation is meaningful
         spread_ratio = (maxv - minv) / (avg + 1e-6)
         is_significant = spread_ratio > 0.1  # at least 10% variation
 
         if is_significant and avg > 1000:
-            msg = (
-                f"**{col.replace('_', ' ').title()}** averages around {avg:,.2f}, "
-                f"totaling {total:,.0f}. Values range between {minv:,.2f} and {maxv:,.2f}, "
-                f"showing significant spread."
-            )
+            tmpl = _TMPL_LARGE
         elif is_significant:
-            msg = (
-                f"**{col.replace('_', ' ').title()}** shows moderate variation, "
-                f"averaging {avg:,.2f} (min {minv:,.2f}, max {maxv:,.2f})."
-            )
+            tmpl = _TMPL_MEDIUM
         else:
-            msg = (
-                f"**{col.replace('_', ' ').title()}** remains relatively stable, "
-                f"averaging {avg:,.2f} with limited variability."
-            )
+            tmpl = _TMPL_STABLE
 
-        insights.append(msg)
+        insights.append(tmpl.format(name=_pretty(col), avg=avg, total=total, minv=minv, maxv=maxv))
 
     # Handle case: if all columns excluded, provide note
     if not insights:
@@ -116,29 +246,24 @@ def generate_dashboard_insights(
     combining KPI summaries + relationships + patterns.
     """
     insights = []
+    # select the numeric columns once and share them with every helper
+    numeric_df = df.select_dtypes(include=[np.number])
 
     # --- KPI Summaries ---
-    insights.extend(basic_kpi_insights(df))
+    insights.extend(basic_kpi_insights(df, numeric_df=numeric_df))
 
     # --- Correlations ---
     if include_correlations:
-        corrs = compute_correlations(df)
+        corrs = compute_correlations(df, numeric_df=numeric_df, top_k=3)
         if corrs:
             top_corrs = corrs[:3]
             for c1, c2, v in top_corrs:
-                insights.append(
-                    f"A notable correlation (**r = {v:.2f}**) exists between **{c1}** and **{c2}**, "
-                    "indicating they move closely together — potentially useful for predictive modeling."
-                )
+                insights.append(_TMPL_CORR.format(r=v, c1=c1, c2=c2))
 
     # --- Anomalies ---
-    for col in df.select_dtypes(include=[np.number]).columns:
-        anoms = detect_anomalies_zscore(df, col)
-        if len(anoms) > 0:
-            insights.append(
-                f"**{col.replace('_', ' ').title()}** shows {len(anoms)} unusual data points (anomalies), "
-                "which may represent exceptional cases, outliers, or potential data errors."
-            )
+    for col, n_anoms in detect_anomalies_all(df, numeric_df=numeric_df).items():
+        if n_anoms > 0:
+            insights.append(_TMPL_ANOMALY.format(name=_pretty(col), count=n_anoms))
 
     # --- Summary Note ---
     insights.append(
@@ -28,10 +28,15 @@ if "initialized" not in st.session_state:
     st.session_state.initialized = True
 
 # --- Load CSS ---
+@st.cache_resource
+def _load_css(path):
+    # read once per server process instead of on every rerun
+    with open(path) as f:
+        return f.read()
+
 css_file = os.path.join(current_dir, "ui", "style.css")
 if os.path.exists(css_file):
-    with open(css_file) as f:
-        st.markdown(f"<style>{f.read()}</style>", unsafe_allow_html=True)
+    st.markdown(f"<style>{_load_css(css_file)}</style>", unsafe_allow_html=True)
 
 # --- Top Bar ---
 render_topbar()
@@ -7,6 +7,16 @@ from Schema_mapper.schema_mapper import infer_field_roles, map_template_fields
 from Dashboard.dashboard_generator import generate_kpi, generate_line, generate_bar, generate_pie, generate_scatter, generate_histogram, generate_heatmap
 from Insight.insight_engine import basic_kpi_insights
 
+
+@st.cache_data
+def _load_template(path):
+    # dashboard template is static; read it once instead of on every run
+    if not os.path.exists(path):
+        return {"title": "Generated Dashboard", "layout": []}
+    with open(path) as f:
+        return json.load(f)
+
+
 def render_topbar():
     user = st.session_state.get("user", {})
     full_name = user.get("name", "")  # Pull directly from logged-in user
@@ -90,15 +100,14 @@ def run_processing(file_info, current_dir):
 
     df, roles, mapping, kpi_results, chart_results, insight_results = None, None, None, [], [], []
 
+    template_file = os.path.join(current_dir, "Dashboard", "sample_dashboard.json")
+
     # --- Define dynamic steps ---
     steps = [
         ("📂Loading data", lambda: load_dataframe(file_info)),
         ("🔍Inferring field roles", lambda: infer_field_roles(df)),
-        ("🗺️Mapping template fields", lambda: map_template_fields(
-            json.load(open(os.path.join(current_dir, "Dashboard", "sample_dashboard.json"))) if os.path.exists(os.path.join(current_dir, "Dashboard", "sample_dashboard.json")) else {"title": "Generated Dashboard","layout": []},
-            roles
-        )),
-        ("📊Generating KPIs", lambda: [generate_kpi(df, c, mapping) for c in json.load(open(os.path.join(current_dir, "Dashboard", "sample_dashboard.json"))) if c.get("type")=="kpi"]),
+        ("🗺️Mapping template fields", lambda: map_template_fields(_load_template(template_file), roles)),
+        ("📊Generating KPIs", lambda: [generate_kpi(df, c, mapping) for c in _load_template(template_file).get("layout", []) if c.get("type")=="kpi"]),
         ("📈Generating Charts", lambda: []),  # handled separately below
         ("💡Generating Insights", lambda: basic_kpi_insights(df))
     ]
@@ -120,8 +129,7 @@ def run_processing(file_info, current_dir):
             time.sleep(1)
 
     # Step 3: Map Template Fields
-    template_file = os.path.join(current_dir, "Dashboard", "sample_dashboard.json")
-    template = json.load(open(template_file)) if os.path.exists(template_file) else {"title": "Generated Dashboard", "layout": []}
+    template = _load_template(template_file)
     with status_box.container():
         with st.spinner(steps[2][0]+"..."):
             mapping = map_template_fields(template, roles)